@@ -1,19 +1,28 @@
 # Savings Community App - Backend
 # This app tracks savings goals, sacrifices, and streaks
 
+import asyncio
+import hashlib
+import json
 import os
+import time
+import urllib.parse
 from datetime import datetime, timedelta
 from typing import Optional, List
-from fastapi import FastAPI, HTTPException, Depends, Header
-from fastapi.responses import RedirectResponse, FileResponse
+from fastapi import FastAPI, HTTPException, Depends, Header, Request, Response
+from fastapi.responses import RedirectResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+import httpx
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings
-from jose import jwt, JWTError
+import jwt
 from google.oauth2 import id_token
 from google.auth.transport import requests as google_requests
+import uvicorn
 import sqlite3
+import threading
+import queue
 from contextlib import contextmanager
 from functools import lru_cache
 
@@ -35,9 +44,173 @@ def get_settings():
 
 settings = get_settings()
 
+# Hot-path settings folded into module constants: handlers skip the
+# per-request attribute lookups, the secret is encoded to bytes once, and
+# jwt.decode gets a single preallocated algorithms list
+JWT_SECRET = settings.jwt_secret.encode()
+JWT_ALG = settings.jwt_alg
+JWT_ALGS = [settings.jwt_alg]
+GOOGLE_CLIENT_ID = settings.google_client_id
+GOOGLE_CLIENT_SECRET = settings.google_client_secret
+GOOGLE_REDIRECT_URI = settings.google_redirect_uri
+
+# The OAuth login URL only depends on static settings, so build (and
+# URL-encode) it once instead of formatting it on every hit
+_GOOGLE_LOGIN_URL = (
+    "https://accounts.google.com/o/oauth2/v2/auth?"
+    + urllib.parse.urlencode({
+        "client_id": GOOGLE_CLIENT_ID,
+        "redirect_uri": GOOGLE_REDIRECT_URI,
+        "response_type": "code",
+        "scope": "openid email profile",
+    })
+)
+
 # ============ DATABASE SETUP ============
 DB_PATH = "savings.db"
 
+def _connect(read_only: bool = False) -> sqlite3.Connection:
+    # cached_statements is raised from the default 128 so every hot query
+    # keeps its prepared VDBE program across calls
+    if read_only:
+        conn = sqlite3.connect(
+            f"file:{DB_PATH}?mode=ro", uri=True,
+            check_same_thread=False, isolation_level=None,
+            cached_statements=256
+        )
+    else:
+        conn = sqlite3.connect(
+            DB_PATH, check_same_thread=False, isolation_level=None,
+            cached_statements=256
+        )
+        # Journal/sync pragmas need write access, so only the writer sets them
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+    conn.row_factory = sqlite3.Row
+    conn.executescript("""
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-64000;
+        PRAGMA mmap_size=268435456;
+    """)
+    return conn
+
+class SqlitePool:
+    """One read-write connection plus a small pool of read-only connections.
+
+    WAL mode allows many concurrent readers alongside a single writer, so
+    read endpoints never queue behind the write lock.
+
+    Checkouts are never ping-validated: local SQLite handles don't die the
+    way network connections do. Instead the writer runs PRAGMA optimize
+    every few minutes on release, letting SQLite refresh its statistics
+    after the workload has shifted. (Readers skip it — refreshing stats
+    writes, and they hold mode=ro handles.)
+    """
+
+    OPTIMIZE_INTERVAL = 300.0
+
+    def __init__(self, readers: Optional[int] = None):
+        if readers is None:
+            readers = min((os.cpu_count() or 1) * 2, 16)
+        self._write_lock = threading.Lock()
+        self._rw_conn = _connect()
+        self._last_optimize = time.monotonic()
+        self._readers = queue.Queue(maxsize=readers)
+        for _ in range(readers):
+            self._readers.put(_connect(read_only=True))
+
+    @contextmanager
+    def get_ro(self):
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def get_rw(self):
+        with self._write_lock:
+            try:
+                yield self._rw_conn
+            finally:
+                now = time.monotonic()
+                if now - self._last_optimize > self.OPTIMIZE_INTERVAL:
+                    self._rw_conn.execute("PRAGMA optimize")
+                    self._last_optimize = now
+
+_pool: Optional[SqlitePool] = None
+
+@contextmanager
+def tx(conn):
+    """Explicit write transaction.
+
+    Connections run with isolation_level=None (no implicit BEGINs), so
+    writers open one deliberately. BEGIN IMMEDIATE takes the write lock up
+    front instead of upgrading on the first write, which avoids busy-retry
+    churn under WAL.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+# ============ SQL STATEMENTS ============
+# Module-level constants so handlers pass the identical string object every
+# call, letting sqlite3's statement cache reuse the prepared program
+SQL_GET_USER = "SELECT * FROM users WHERE id = ?"
+SQL_USER_BY_SUB = "SELECT * FROM users WHERE google_sub = ?"
+SQL_INSERT_USER = "INSERT INTO users (email, name, avatar_url, google_sub) VALUES (?, ?, ?, ?)"
+SQL_UPDATE_USER_STATS = "UPDATE users SET total_saved = total_saved + ?, current_streak = current_streak + 1 WHERE id = ?"
+SQL_INSERT_GOAL = "INSERT INTO goals (user_id, title, target_amount, category) VALUES (?, ?, ?, ?)"
+SQL_UPSERT_SACRIFICE = """INSERT INTO sacrifices (user_id, title, amount, last_done_date)
+                   VALUES (?, ?, ?, ?)
+                   ON CONFLICT(user_id, title) DO UPDATE SET
+                       days_count = days_count + 1,
+                       last_done_date = excluded.last_done_date
+                   RETURNING days_count"""
+
+SQL_DASHBOARD = """
+    SELECT
+        (SELECT json_object(
+            'id', id, 'email', email, 'name', name,
+            'avatar_url', avatar_url, 'google_sub', google_sub,
+            'total_saved', total_saved, 'current_streak', current_streak,
+            'last_save_date', last_save_date, 'created_at', created_at)
+         FROM users WHERE id = :uid),
+        (SELECT json_group_array(json_object(
+            'id', id, 'user_id', user_id, 'title', title,
+            'target_amount', target_amount, 'current_amount', current_amount,
+            'category', category, 'created_at', created_at))
+         FROM (SELECT * FROM goals
+               WHERE user_id = :uid ORDER BY created_at DESC)),
+        (SELECT json_group_array(json_object(
+            'id', id, 'user_id', user_id, 'title', title,
+            'amount', amount, 'days_count', days_count,
+            'last_done_date', last_done_date, 'created_at', created_at))
+         FROM (SELECT * FROM sacrifices
+               WHERE user_id = :uid ORDER BY created_at DESC LIMIT 5))
+"""
+
+SQL_FEED = """
+    SELECT json_group_array(json_object(
+        'id', v.id, 'user_id', v.user_id, 'event_type', v.event_type,
+        'event_data', json(v.event_data), 'created_at', v.created_at,
+        'name', u.name, 'avatar_url', u.avatar_url))
+    FROM (SELECT * FROM v_feed ORDER BY created_at DESC LIMIT 20) v
+    JOIN users u ON v.user_id = u.id
+"""
+
+SQL_LEADERBOARD = """
+    SELECT json_group_array(json_object(
+        'id', id, 'name', name, 'avatar_url', avatar_url,
+        'total_saved', total_saved, 'current_streak', current_streak))
+    FROM (SELECT id, name, avatar_url, total_saved, current_streak
+          FROM users ORDER BY total_saved DESC LIMIT 10)
+"""
+
 def init_db():
     conn = sqlite3.connect(DB_PATH)
     c = conn.cursor()
@@ -79,106 +252,92 @@ def init_db():
         FOREIGN KEY (user_id) REFERENCES users(id)
     )''')
     
-    # Feed events table
-    c.execute('''CREATE TABLE IF NOT EXISTS feed_events (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id INTEGER NOT NULL,
-        event_type TEXT NOT NULL,
-        event_data TEXT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (user_id) REFERENCES users(id)
-    )''')
-    
+    # The feed is derived from goals and sacrifices instead of being stored
+    # as duplicate rows: every goal/sacrifice already carries everything a
+    # feed entry needs, so a view avoids doubling each write. (Databases
+    # from older versions keep their now-unused feed_events table.)
+    c.execute('''CREATE VIEW IF NOT EXISTS v_feed AS
+        SELECT id, user_id, 'goal_created' AS event_type,
+               json_object('goal_id', id, 'title', title) AS event_data,
+               created_at
+        FROM goals
+        UNION ALL
+        SELECT id, user_id, 'sacrifice_logged',
+               json_object('sacrifice_id', id, 'title', title, 'days', days_count),
+               created_at
+        FROM sacrifices''')
+
+    # Indexes for the hot lookups (dashboard goals/sacrifices by user, feed
+    # ordered by recency, feed join back to users). email and google_sub
+    # already get UNIQUE indexes from the table definition.
+    c.execute("CREATE INDEX IF NOT EXISTS idx_goals_user ON goals(user_id, created_at DESC)")
+    # log_sacrifice's upsert targets ON CONFLICT(user_id, title), which needs
+    # a UNIQUE index; drop the plain index it replaces from older databases
+    c.execute("DROP INDEX IF EXISTS idx_sac_user_title")
+    c.execute("CREATE UNIQUE INDEX IF NOT EXISTS uq_sac_user_title ON sacrifices(user_id, title)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_goals_created ON goals(created_at DESC)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_sac_created ON sacrifices(created_at DESC)")
+
     conn.commit()
-    
+
     # Add dummy users if database is empty
     c.execute("SELECT COUNT(*) FROM users")
     if c.fetchone()[0] == 0:
         create_dummy_data(c, conn)
-    
+
+    # Refresh planner statistics now that tables and indexes exist
+    c.execute("ANALYZE")
+    conn.commit()
     conn.close()
 
 def create_dummy_data(c, conn):
     """Create dummy users and data for demo"""
-    import json
-    
-    # Dummy users
-    users = [
-        ("dummy1@example.com", "Richa Gupta", "https://i.pravatar.cc/150?img=1", "dummy-1", 421.50, 5),
-        ("dummy2@example.com", "James Chen", "https://i.pravatar.cc/150?img=12", "dummy-2", 285.00, 3),
-        ("dummy3@example.com", "Sarah Johnson", "https://i.pravatar.cc/150?img=5", "dummy-3", 567.25, 7),
-    ]
-    
-    for email, name, avatar, sub, saved, streak in users:
-        c.execute(
+    now = datetime.now().isoformat()
+
+    # One transaction for the whole seed so there is a single fsync instead
+    # of one implicit commit per INSERT
+    with conn:
+        # Dummy users
+        users = [
+            ("dummy1@example.com", "Richa Gupta", "https://i.pravatar.cc/150?img=1", "dummy-1", 421.50, 5, now),
+            ("dummy2@example.com", "James Chen", "https://i.pravatar.cc/150?img=12", "dummy-2", 285.00, 3, now),
+            ("dummy3@example.com", "Sarah Johnson", "https://i.pravatar.cc/150?img=5", "dummy-3", 567.25, 7, now),
+        ]
+        c.executemany(
             "INSERT INTO users (email, name, avatar_url, google_sub, total_saved, current_streak, last_save_date) VALUES (?, ?, ?, ?, ?, ?, ?)",
-            (email, name, avatar, sub, saved, streak, datetime.now().isoformat())
+            users
         )
-    
-    conn.commit()
-    
-    # Get user IDs
-    c.execute("SELECT id FROM users WHERE email LIKE 'dummy%' ORDER BY id")
-    user_ids = [row[0] for row in c.fetchall()]
-    
-    # Goals for users
-    goals = [
-        (user_ids[0], "Concert Tickets", 180.0, 45.0, "Entertainment"),
-        (user_ids[0], "Weekend Trip", 400.0, 120.0, "Travel"),
-        (user_ids[1], "New Laptop", 800.0, 285.0, "Technology"),
-        (user_ids[2], "Emergency Fund", 1000.0, 567.25, "Savings"),
-    ]
-    
-    for user_id, title, target, current, category in goals:
-        c.execute(
+
+        # Get user IDs
+        c.execute("SELECT id FROM users WHERE email LIKE 'dummy%' ORDER BY id")
+        user_ids = [row[0] for row in c.fetchall()]
+
+        # Goals for users
+        goals = [
+            (user_ids[0], "Concert Tickets", 180.0, 45.0, "Entertainment"),
+            (user_ids[0], "Weekend Trip", 400.0, 120.0, "Travel"),
+            (user_ids[1], "New Laptop", 800.0, 285.0, "Technology"),
+            (user_ids[2], "Emergency Fund", 1000.0, 567.25, "Savings"),
+        ]
+        c.executemany(
             "INSERT INTO goals (user_id, title, target_amount, current_amount, category) VALUES (?, ?, ?, ?, ?)",
-            (user_id, title, target, current, category)
+            goals
         )
-    
-    # Sacrifices
-    sacrifices = [
-        (user_ids[0], "Skipped Latte", 4.50, 4, datetime.now().isoformat()),
-        (user_ids[0], "Packed Lunch", 9.50, 5, datetime.now().isoformat()),
-        (user_ids[1], "No Takeout", 15.00, 3, datetime.now().isoformat()),
-        (user_ids[2], "Walked Instead", 8.00, 7, datetime.now().isoformat()),
-    ]
-    
-    for user_id, title, amount, days, date in sacrifices:
-        c.execute(
+
+        # Sacrifices
+        sacrifices = [
+            (user_ids[0], "Skipped Latte", 4.50, 4, now),
+            (user_ids[0], "Packed Lunch", 9.50, 5, now),
+            (user_ids[1], "No Takeout", 15.00, 3, now),
+            (user_ids[2], "Walked Instead", 8.00, 7, now),
+        ]
+        c.executemany(
             "INSERT INTO sacrifices (user_id, title, amount, days_count, last_done_date) VALUES (?, ?, ?, ?, ?)",
-            (user_id, title, amount, days, date)
+            sacrifices
         )
-    
-    # Feed events
-    c.execute("SELECT id, user_id, title FROM goals")
-    for goal_id, user_id, title in c.fetchall():
-        event_data = json.dumps({"goal_id": goal_id, "title": title})
-        c.execute(
-            "INSERT INTO feed_events (user_id, event_type, event_data) VALUES (?, ?, ?)",
-            (user_id, "goal_created", event_data)
-        )
-    
-    c.execute("SELECT id, user_id, title, days_count FROM sacrifices")
-    for sac_id, user_id, title, days in c.fetchall():
-        event_data = json.dumps({"sacrifice_id": sac_id, "title": title, "days": days})
-        c.execute(
-            "INSERT INTO feed_events (user_id, event_type, event_data) VALUES (?, ?, ?)",
-            (user_id, "sacrifice_logged", event_data)
-        )
-    
-    conn.commit()
-
-@contextmanager
-def get_db():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    try:
-        yield conn
-    finally:
-        conn.close()
 
 # ============ APP INITIALIZATION ============
-app = FastAPI(title="Savings Community", version="1.0.0")
+app = FastAPI(title="Savings Community", version="1.0.0", default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -188,32 +347,72 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# index.html is invariant between deploys, so it is read once at startup
+# and served from memory with a precomputed ETag
+_index_html = b""
+_index_etag = ""
+
 @app.on_event("startup")
 def startup():
+    global _pool, _index_html, _index_etag
     init_db()
+    _pool = SqlitePool()
+
+    with open("index.html", "rb") as f:
+        _index_html = f.read()
+    _index_etag = '"' + hashlib.md5(_index_html).hexdigest() + '"'
+
 
 # ============ AUTH HELPERS ============
 google_request = google_requests.Request()
 
+# Shared client so the TLS connection pool to Google's endpoints stays warm
+# across OAuth callbacks instead of paying a TCP+TLS handshake per login
+_http_client = httpx.AsyncClient(timeout=10.0)
+
+# Verified-token cache: decoding costs HMAC-SHA256 + base64 + JSON parsing
+# on every authenticated request, while tokens stay valid for 24h. Entries
+# expire after a short TTL and the dict is bounded so junk tokens can't
+# grow it without limit.
+_TOKEN_CACHE_MAX = 10_000
+_TOKEN_CACHE_TTL = 300
+_token_cache: dict = {}
+_token_cache_lock = threading.Lock()
+
 def create_jwt_token(user_id: int) -> str:
     payload = {
         "sub": str(user_id),
         "exp": datetime.utcnow() + timedelta(hours=24)
     }
-    return jwt.encode(payload, settings.jwt_secret, algorithm=settings.jwt_alg)
+    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALG)
 
 def get_current_user(authorization: str = Header(...)):
     if not authorization.startswith("Bearer "):
         raise HTTPException(401, "Invalid authorization header")
-    
+
     token = authorization.split(" ", 1)[1]
+    now = time.time()
+
+    cached = _token_cache.get(token)
+    if cached is not None:
+        user_id, expires = cached
+        if now < expires:
+            return user_id
+        with _token_cache_lock:
+            _token_cache.pop(token, None)
+
     try:
-        payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_alg])
+        payload = jwt.decode(token, JWT_SECRET, algorithms=JWT_ALGS)
         user_id = int(payload["sub"])
-        return user_id
-    except JWTError:
+    except jwt.PyJWTError:
         raise HTTPException(401, "Invalid or expired token")
 
+    with _token_cache_lock:
+        if len(_token_cache) >= _TOKEN_CACHE_MAX:
+            _token_cache.clear()
+        _token_cache[token] = (user_id, min(now + _TOKEN_CACHE_TTL, payload["exp"]))
+    return user_id
+
 # ============ PYDANTIC MODELS ============
 class GoalCreate(BaseModel):
     title: str
@@ -226,77 +425,75 @@ class SacrificeCreate(BaseModel):
 
 # ============ ROOT & AUTH ROUTES ============
 @app.get("/")
-def root():
-    return FileResponse("index.html")
+def root(request: Request):
+    if request.headers.get("if-none-match") == _index_etag:
+        return Response(status_code=304)
+    return Response(
+        _index_html, media_type="text/html",
+        headers={"ETag": _index_etag, "Cache-Control": "public, max-age=60"}
+    )
 
 @app.get("/auth/google/login")
 def google_login():
-    scope = "openid email profile"
-    url = (
-        "https://accounts.google.com/o/oauth2/v2/auth"
-        f"?client_id={settings.google_client_id}"
-        f"&redirect_uri={settings.google_redirect_uri}"
-        f"&response_type=code"
-        f"&scope={scope}"
-    )
-    return RedirectResponse(url)
+    return RedirectResponse(_GOOGLE_LOGIN_URL)
 
 @app.get("/auth/google/callback")
 async def google_callback(code: str):
-    import httpx
-    
-    async with httpx.AsyncClient() as client:
-        token_resp = await client.post(
+    token_resp = await _http_client.post(
             "https://oauth2.googleapis.com/token",
             data={
-                "client_id": settings.google_client_id,
-                "client_secret": settings.google_client_secret,
+                "client_id": GOOGLE_CLIENT_ID,
+                "client_secret": GOOGLE_CLIENT_SECRET,
                 "code": code,
                 "grant_type": "authorization_code",
-                "redirect_uri": settings.google_redirect_uri
+                "redirect_uri": GOOGLE_REDIRECT_URI
             }
         )
         
-        if token_resp.status_code != 200:
-            raise HTTPException(400, "Failed to get Google tokens")
-        
-        tokens = token_resp.json()
-        
-        userinfo_resp = await client.get(
-            "https://www.googleapis.com/oauth2/v3/userinfo",
-            headers={"Authorization": f"Bearer {tokens['access_token']}"}
-        )
-        
-        if userinfo_resp.status_code != 200:
-            raise HTTPException(400, "Failed to get user info")
-        
-        info = userinfo_resp.json()
-    
-    with get_db() as conn:
+    if token_resp.status_code != 200:
+        raise HTTPException(400, "Failed to get Google tokens")
+
+    tokens = token_resp.json()
+
+    userinfo_resp = await _http_client.get(
+        "https://www.googleapis.com/oauth2/v3/userinfo",
+        headers={"Authorization": f"Bearer {tokens['access_token']}"}
+    )
+
+    if userinfo_resp.status_code != 200:
+        raise HTTPException(400, "Failed to get user info")
+
+    info = userinfo_resp.json()
+
+    # google_callback is async, so run the synchronous sqlite3 work on the
+    # threadpool instead of blocking the event loop
+    user_id = await asyncio.to_thread(_lookup_or_create_user, info)
+
+    access_token = create_jwt_token(user_id)
+
+    return RedirectResponse(f"/?token={access_token}")
+
+def _lookup_or_create_user(info: dict) -> int:
+    with _pool.get_rw() as conn:
         c = conn.cursor()
-        c.execute("SELECT * FROM users WHERE google_sub = ?", (info["sub"],))
+        c.execute(SQL_USER_BY_SUB, (info["sub"],))
         user = c.fetchone()
-        
+
         if not user:
-            c.execute(
-                "INSERT INTO users (email, name, avatar_url, google_sub) VALUES (?, ?, ?, ?)",
-                (info.get("email"), info.get("name"), info.get("picture"), info["sub"])
-            )
-            conn.commit()
-            user_id = c.lastrowid
-        else:
-            user_id = user["id"]
-    
-    access_token = create_jwt_token(user_id)
-    
-    return RedirectResponse(f"/?token={access_token}")
+            with tx(conn):
+                c.execute(
+                    SQL_INSERT_USER,
+                    (info.get("email"), info.get("name"), info.get("picture"), info["sub"])
+                )
+            return c.lastrowid
+        return user["id"]
 
 # ============ USER ROUTES ============
 @app.get("/api/me")
 def get_me(user_id: int = Depends(get_current_user)):
-    with get_db() as conn:
+    with _pool.get_ro() as conn:
         c = conn.cursor()
-        c.execute("SELECT * FROM users WHERE id = ?", (user_id,))
+        c.execute(SQL_GET_USER, (user_id,))
         user = c.fetchone()
         if not user:
             raise HTTPException(404, "User not found")
@@ -304,124 +501,98 @@ def get_me(user_id: int = Depends(get_current_user)):
 
 @app.get("/api/dashboard")
 def get_dashboard(user_id: int = Depends(get_current_user)):
-    with get_db() as conn:
+    with _pool.get_ro() as conn:
         c = conn.cursor()
-        
-        # User stats
-        c.execute("SELECT * FROM users WHERE id = ?", (user_id,))
-        user = dict(c.fetchone())
-        
-        # Active goals
-        c.execute("SELECT * FROM goals WHERE user_id = ? ORDER BY created_at DESC", (user_id,))
-        goals = [dict(row) for row in c.fetchall()]
-        
-        # Recent sacrifices
-        c.execute("SELECT * FROM sacrifices WHERE user_id = ? ORDER BY created_at DESC LIMIT 5", (user_id,))
-        sacrifices = [dict(row) for row in c.fetchall()]
-        
+
+        # One statement instead of three round-trips: SQLite aggregates the
+        # user row, goals and recent sacrifices into JSON server-side
+        c.execute(SQL_DASHBOARD, {"uid": user_id})
+        user_json, goals_json, sacrifices_json = c.fetchone()
+
+        if user_json is None:
+            raise HTTPException(404, "User not found")
+
         return {
-            "user": user,
-            "goals": goals,
-            "sacrifices": sacrifices
+            "user": json.loads(user_json),
+            "goals": json.loads(goals_json),
+            "sacrifices": json.loads(sacrifices_json)
         }
 
+# Whole-response caches for the anonymous read endpoints: the payloads are
+# identical for every caller, so the rendered JSON is kept for a few seconds
+# and dropped whenever a write lands. At two keys the cache stays tiny.
+_FEED_CACHE_TTL = 5
+_LEADERBOARD_CACHE_TTL = 30
+_response_cache: dict = {}
+
+def _cached_json(key: str, ttl: int, build) -> Response:
+    now = time.monotonic()
+    hit = _response_cache.get(key)
+    if hit is not None and now < hit[0]:
+        body = hit[1]
+    else:
+        body = build()
+        _response_cache[key] = (now + ttl, body)
+    return Response(content=body, media_type="application/json")
+
 @app.get("/api/feed")
 def get_feed():
-    import json
-    with get_db() as conn:
+    return _cached_json("feed", _FEED_CACHE_TTL, _build_feed_json)
+
+def _build_feed_json() -> str:
+    with _pool.get_ro() as conn:
         c = conn.cursor()
-        c.execute("""
-            SELECT f.*, u.name, u.avatar_url 
-            FROM feed_events f
-            JOIN users u ON f.user_id = u.id
-            ORDER BY f.created_at DESC
-            LIMIT 20
-        """)
-        
-        events = []
-        for row in c.fetchall():
-            event = dict(row)
-            event['event_data'] = json.loads(event['event_data'])
-            events.append(event)
-        
-        return events
+        # SQLite renders the response JSON in one pass, rebuilding the
+        # event_data object from the structured columns, so there is no
+        # per-row dict materialization in Python
+        c.execute(SQL_FEED)
+        return c.fetchone()[0]
 
 @app.get("/api/leaderboard")
 def get_leaderboard():
-    with get_db() as conn:
+    return _cached_json("leaderboard", _LEADERBOARD_CACHE_TTL, _build_leaderboard_json)
+
+def _build_leaderboard_json() -> str:
+    with _pool.get_ro() as conn:
         c = conn.cursor()
-        c.execute("""
-            SELECT id, name, avatar_url, total_saved, current_streak
-            FROM users
-            ORDER BY total_saved DESC
-            LIMIT 10
-        """)
-        return [dict(row) for row in c.fetchall()]
+        c.execute(SQL_LEADERBOARD)
+        return c.fetchone()[0]
 
 @app.post("/api/goals")
 def create_goal(goal: GoalCreate, user_id: int = Depends(get_current_user)):
-    import json
-    with get_db() as conn:
+    with _pool.get_rw() as conn:
         c = conn.cursor()
-        c.execute(
-            "INSERT INTO goals (user_id, title, target_amount, category) VALUES (?, ?, ?, ?)",
-            (user_id, goal.title, goal.target_amount, goal.category)
-        )
-        goal_id = c.lastrowid
-        
-        # Add to feed
-        event_data = json.dumps({"goal_id": goal_id, "title": goal.title})
-        c.execute(
-            "INSERT INTO feed_events (user_id, event_type, event_data) VALUES (?, ?, ?)",
-            (user_id, "goal_created", event_data)
-        )
-        
-        conn.commit()
+        with tx(conn):
+            c.execute(
+                SQL_INSERT_GOAL,
+                (user_id, goal.title, goal.target_amount, goal.category)
+            )
+            goal_id = c.lastrowid
+
+        _response_cache.clear()
         return {"id": goal_id, "title": goal.title}
 
 @app.post("/api/sacrifices")
 def log_sacrifice(sacrifice: SacrificeCreate, user_id: int = Depends(get_current_user)):
-    import json
-    with get_db() as conn:
+    with _pool.get_rw() as conn:
         c = conn.cursor()
-        
-        # Check if sacrifice exists
-        c.execute("SELECT * FROM sacrifices WHERE user_id = ? AND title = ?", (user_id, sacrifice.title))
-        existing = c.fetchone()
-        
-        if existing:
-            # Update days count
-            new_days = existing["days_count"] + 1
+        # One upsert replaces the SELECT-then-INSERT-or-UPDATE dance, and the
+        # explicit transaction gives both statements a single fsync
+        with tx(conn):
             c.execute(
-                "UPDATE sacrifices SET days_count = ?, last_done_date = ? WHERE id = ?",
-                (new_days, datetime.now().isoformat(), existing["id"])
+                SQL_UPSERT_SACRIFICE,
+                (user_id, sacrifice.title, sacrifice.amount, datetime.now().isoformat())
             )
-            sacrifice_id = existing["id"]
-        else:
-            # Create new
+            new_days = c.fetchone()[0]
+
+            # Update user total saved and streak
             c.execute(
-                "INSERT INTO sacrifices (user_id, title, amount, last_done_date) VALUES (?, ?, ?, ?)",
-                (user_id, sacrifice.title, sacrifice.amount, datetime.now().isoformat())
+                SQL_UPDATE_USER_STATS,
+                (sacrifice.amount, user_id)
             )
-            sacrifice_id = c.lastrowid
-            new_days = 1
-        
-        # Update user total saved and streak
-        c.execute(
-            "UPDATE users SET total_saved = total_saved + ?, current_streak = current_streak + 1 WHERE id = ?",
-            (sacrifice.amount, user_id)
-        )
-        
-        # Add to feed
-        event_data = json.dumps({"sacrifice_id": sacrifice_id, "title": sacrifice.title, "days": new_days})
-        c.execute(
-            "INSERT INTO feed_events (user_id, event_type, event_data) VALUES (?, ?, ?)",
-            (user_id, "sacrifice_logged", event_data)
-        )
-        
-        conn.commit()
+
+        _response_cache.clear()
         return {"message": "Sacrifice logged", "days": new_days}
 
 if __name__ == "__main__":
-    import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8002)
\ No newline at end of file